@@ -1,23 +1,60 @@
-from fastapi import FastAPI, HTTPException, Request, Form
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from fastapi import Depends, FastAPI, Request, Form
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from types import MappingProxyType
 import httpx
+import orjson
+
+EGOV_API_URL = "https://api.example.com/official_document"  # 実際のAPIエンドポイントに変更
+# リクエストごとに辞書を組み立てないよう、固定のヘッダーは読み込み時に一度だけ作る
+EGOV_API_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "Authorization": "Bearer your_access_token",  # 実際のアクセストークンに変更
+    "x-6eovAPI-Trial": "true"
+})
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # リクエストごとにクライアントを作らず、接続プールをアプリ全体で共有する
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 templates = Jinja2Templates(directory="app/templates")
 
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
+
+MODEL_CONFIG = ConfigDict(defer_build=True)
+
 class OfficialDocumentRequest(BaseModel):
+    model_config = MODEL_CONFIG
+
     arrive_id: str
     notice_sub_id: int
 
 class Metadata(BaseModel):
+    model_config = MODEL_CONFIG
+
     title: str
     detail: str
     type: str
     instance: str
 
 class Result(BaseModel):
+    model_config = MODEL_CONFIG
+
     arrive_id: str
     notice_sub_id: int
     proc_name: str
@@ -26,28 +63,33 @@ class Result(BaseModel):
     file_name_list: list
 
 class OfficialDocumentResponse(BaseModel):
+    model_config = MODEL_CONFIG
+
     metadata: Metadata
     results: Result
 
+@lru_cache(maxsize=1)
+def render_index() -> str:
+    # 入力フォームだけのページは内容が変わらないので、最初の一回だけ描画する
+    return templates.get_template("index.html").render()
+
 @app.get("/", response_class=HTMLResponse)
-async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+async def read_root():
+    return HTMLResponse(render_index())
 
 @app.post("/official_document", response_class=HTMLResponse)
-async def get_official_document(request: Request, arrive_id: str = Form(...), notice_sub_id: int = Form(...)):
-    url = "https://api.example.com/official_document"  # 実際のAPIエンドポイントに変更
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": "Bearer your_access_token",  # 実際のアクセストークンに変更
-        "x-6eovAPI-Trial": "true"
-    }
+async def get_official_document(
+    request: Request,
+    arrive_id: str = Form(...),
+    notice_sub_id: int = Form(...),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     payload = {"arrive_id": arrive_id, "notice_sub_id": notice_sub_id}
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()  # HTTPステータスコードが200番台でない場合例外を発生
-        document = response.json()
+        response = await client.post(EGOV_API_URL, json=payload, headers=EGOV_API_HEADERS)
+        response.raise_for_status()  # HTTPステータスコードが200番台でない場合例外を発生
+        document = orjson.loads(response.content)  # 標準のjsonより高速にデコードする
         return templates.TemplateResponse("index.html", {"request": request, "document": document})
     except httpx.HTTPStatusError as exc:
         error_message = f"HTTP error occurred: {exc.response.status_code} - {exc.response.text}"